@@ -26,8 +26,8 @@ def main():
         langue = detect_language(contenu_clean)
         source_type = get_domain_type(url)
 
-        # Phase 2 : LLM
-        llm_fields = extract_fields_with_llm(contenu_clean, url)
+        # Phase 2 : LLM (texte brut : les retours à la ligne servent au découpage en paragraphes)
+        llm_fields = extract_fields_with_llm(raw_data["contenu"], url)
 
         # Compter caractères et mots
         nb_caracteres = len(contenu_clean)
@@ -1,7 +1,11 @@
 import ollama
 import re
+from src.text_reducer import (
+    BUDGET_TOKENS, CHARS_PAR_TOKEN, blocs_pertinents, decouper_en_chunks, empaqueter, necessite_map_reduce
+)
 
 MODEL = "llama3.2"  # ou "mistral", "gemma2:9b" selon vos tests
+MAX_CHUNKS_MAP = 6  # Nombre max d'appels "map" pour un article très long
 
 def query_ollama(prompt: str) -> str:
     try:
@@ -14,7 +18,40 @@ def query_ollama(prompt: str) -> str:
     except Exception as e:
         return f"[Erreur LLM: {str(e)}]"
 
+def condenser_texte_long(blocs: list) -> str:
+    # Phase "map" : notes factuelles par chunk, sur les chunks les plus pertinents
+    chunks = decouper_en_chunks(blocs, BUDGET_TOKENS)
+    indices = sorted(range(len(chunks)), key=lambda i: chunks[i][1], reverse=True)[:MAX_CHUNKS_MAP]
+
+    notes = []
+    for i in sorted(indices):
+        prompt = f"""
+Tu es un assistant expert en santé animale. Extrais de cet extrait d'article, en français et en 80 mots maximum, uniquement les faits utiles : date, lieu, maladie, espèces animales, nombre de cas ou de foyers, mesures prises. Ne jamais inventer d'informations. Si l'extrait ne contient rien d'utile, réponds exactement RIEN, sans autre texte.
+
+Extrait :
+{chunks[i][0]}
+"""
+        note = query_ollama(prompt)
+        if note and not note.startswith("[Erreur LLM") and note.strip().strip('."\'').upper() != "RIEN":
+            notes.append(note)
+
+    # Phase "reduce" : les notes remplacent le texte brut dans le prompt final
+    if not notes:
+        return empaqueter(blocs, BUDGET_TOKENS)
+    return "\n".join(notes)[:BUDGET_TOKENS * CHARS_PAR_TOKEN]
+
+def preparer_contenu(text: str) -> str:
+    # Segmentation et scoring faits une seule fois par article
+    blocs = blocs_pertinents(text)
+    if not blocs:
+        return text[:BUDGET_TOKENS * CHARS_PAR_TOKEN]
+    if necessite_map_reduce(blocs):
+        return condenser_texte_long(blocs)
+    return empaqueter(blocs, BUDGET_TOKENS)
+
 def extract_fields_with_llm(text: str, url: str):
+    contenu = preparer_contenu(text)
+
     # Prompt général pour extraire tous les champs
     prompt = f"""
 Tu es un assistant expert en santé animale. Analyse le texte suivant et extrais les informations demandées. Réponds strictement en format JSON avec les clés suivantes : 
@@ -32,7 +69,7 @@ Règles :
 - Si une info n'est pas dans le texte, mets "inconnu(e)".
 
 Texte à analyser :
-{text[:4000]}  # Limite raisonnable pour le contexte
+{contenu}
 """
 
     raw_response = query_ollama(prompt)
@@ -0,0 +1,211 @@
+import math
+import re
+
+# Estimation grossière : ~4 caractères par token pour llama3.2 / mistral
+CHARS_PAR_TOKEN = 4
+BUDGET_TOKENS = 1000           # Contexte envoyé au LLM pour l'extraction finale
+TAILLE_CHUNK_TOKENS = 200      # Taille max d'un bloc (paragraphe ou groupe de phrases)
+SEUIL_MAP_REDUCE = 3           # Au-delà de N budgets de contenu utile → map-reduce
+MIN_MOTS_SCORE = 20            # Longueur plancher pour la densité de mots-clés
+
+MOTS_CLES_MALADIES = [
+    "maladie", "épizootie", "epizootie", "épidémie", "epidemie", "foyer", "foyers",
+    "virus", "viral", "bactérie", "infection", "contamination", "abattage", "vaccin",
+    "vaccination", "grippe aviaire", "influenza", "h5n1", "peste", "fièvre", "fievre",
+    "aphteuse", "tuberculose", "brucellose", "rage", "charbon", "dermatose", "nodulaire",
+    "fco", "langue bleue", "newcastle", "clavelée", "variole", "mortalité", "symptômes",
+    "disease", "outbreak", "avian", "flu", "fever", "swine", "culling", "infection",
+    "west nile", "anthrax", "rabies", "vaccine",
+    "مرض", "أمراض", "وباء", "انفلونزا", "إنفلونزا", "أنفلونزا", "حمى", "فيروس", "طاعون",
+]
+
+MOTS_CLES_ANIMAUX = [
+    "animal", "animaux", "bétail", "betail", "cheptel", "élevage", "elevage", "éleveur",
+    "bovin", "bovins", "vache", "vaches", "ovin", "ovins", "mouton", "moutons", "caprin",
+    "chèvre", "chèvres", "porc", "porcs", "porcin", "volaille", "volailles", "poulet",
+    "poulets", "canard", "canards", "dinde", "oiseau", "oiseaux", "chameau", "dromadaire",
+    "cheval", "chevaux", "équin", "chien", "chiens", "chat", "faune", "sauvage",
+    "livestock", "cattle", "poultry", "pig", "sheep", "goat", "bird", "horse", "cow",
+    "chicken", "turkey", "duck", "camel",
+    "أبقار", "أغنام", "دواجن", "ماشية", "طيور", "خيول", "ماعز", "إبل", "مواشي",
+]
+
+# Lignes typiques de pied de page / bandeaux à écarter (blocs de moins de 25 mots)
+MOTIFS_BOILERPLATE = re.compile(
+    r"©|\b(?:cookies?|newsletter|abonnez|s'abonner|inscrivez|se connecter|mot de passe|"
+    r"tous droits|copyright|mentions légales|politique de confidentialité|"
+    r"lire aussi|à lire aussi|voir aussi|publicité|subscribe|sign in|log in|read more|"
+    r"partager sur|share on|share this|suivez-nous|follow us)\b",
+    re.IGNORECASE,
+)
+
+# Mots de navigation trop génériques : écartés seulement sur des lignes très courtes
+MOTIFS_NAVIGATION = re.compile(
+    r"\b(?:menu|accueil|recherche|rechercher|connexion|partager|facebook|twitter|"
+    r"whatsapp|linkedin|share|privacy)\b",
+    re.IGNORECASE,
+)
+
+REGEX_DATE = re.compile(
+    r"\b(?:19|20)\d{2}\b|\b\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\b",
+)
+
+# Préfixes arabes usuels (و، ب، ال...) et pluriels français / anglais
+_REGEX_MOTS_CLES = re.compile(
+    r"\b(?:وال|بال|لل|ال|و|ب)?(?:"
+    + "|".join(re.escape(m) for m in sorted(MOTS_CLES_MALADIES + MOTS_CLES_ANIMAUX, key=len, reverse=True))
+    + r")(?:s|x|es)?\b",
+    re.IGNORECASE,
+)
+
+
+def estimer_tokens(text: str) -> int:
+    return len(text) // CHARS_PAR_TOKEN + 1
+
+
+def regrouper_phrases(text: str) -> list:
+    # Regroupe les phrases en blocs d'au plus TAILLE_CHUNK_TOKENS ; une phrase
+    # plus longue que la limite est coupée sur les mots
+    taille_max = TAILLE_CHUNK_TOKENS * CHARS_PAR_TOKEN
+    morceaux = []
+    for phrase in re.split(r"(?<=[.!?؟])\s+", text.strip()):
+        while len(phrase) > taille_max:
+            coupure = phrase.rfind(" ", 0, taille_max)
+            if coupure <= 0:
+                coupure = taille_max
+            morceaux.append(phrase[:coupure].strip())
+            phrase = phrase[coupure:].strip()
+        if phrase:
+            morceaux.append(phrase)
+
+    blocs, courant = [], ""
+    for morceau in morceaux:
+        if courant and estimer_tokens(courant + " " + morceau) > TAILLE_CHUNK_TOKENS:
+            blocs.append(courant)
+            courant = morceau
+        else:
+            courant = f"{courant} {morceau}".strip()
+    if courant:
+        blocs.append(courant)
+    return blocs
+
+
+def decouper_blocs(text: str) -> list:
+    # Paragraphes si le texte a gardé ses retours à la ligne (sortie Selenium),
+    # sinon regroupement de phrases (texte déjà passé par clean_text). Les
+    # paragraphes trop longs sont redécoupés pour toujours tenir dans le budget.
+    blocs = []
+    for ligne in re.split(r"\n+", text):
+        ligne = ligne.strip()
+        if not ligne:
+            continue
+        if estimer_tokens(ligne) > TAILLE_CHUNK_TOKENS:
+            blocs.extend(regrouper_phrases(ligne))
+        else:
+            blocs.append(ligne)
+    return blocs
+
+
+def est_boilerplate(bloc: str) -> bool:
+    # Heuristique type "readability" : pieds de page et bandeaux, liens de
+    # navigation, blocs courts sans ponctuation de phrase ou avec peu de lettres.
+    # Un mot-clé ne sauve un bandeau que si le bloc est une vraie phrase.
+    mots = bloc.split()
+    if not mots:
+        return True
+    mot_cle = _REGEX_MOTS_CLES.search(bloc) is not None
+    phrase_complete = re.search(r"[.!?:;؟]", bloc) is not None
+    if len(mots) < 25 and MOTIFS_BOILERPLATE.search(bloc):
+        return not (mot_cle and phrase_complete and len(mots) >= 6)
+    if len(mots) < 4 and MOTIFS_NAVIGATION.search(bloc):
+        return True
+    # Les lignes de date (signature, "Publié le ...") alimentent date_publication
+    if REGEX_DATE.search(bloc):
+        return False
+    # Titres courts sur la maladie ("Grippe aviaire au Maroc") ; les liens de
+    # rubrique d'un ou deux mots ("Élevage", "Faune sauvage") restent écartés
+    if mot_cle and len(mots) >= 3:
+        return False
+    lettres = sum(c.isalpha() for c in bloc)
+    if lettres / len(bloc) < 0.5:
+        return True
+    if len(mots) < 6 and not phrase_complete:
+        return True
+    return False
+
+
+def compter_mots_cles(bloc: str) -> int:
+    return len(_REGEX_MOTS_CLES.findall(bloc))
+
+
+def score_bloc(bloc: str, position: int) -> float:
+    occurrences = compter_mots_cles(bloc)
+    # Densité sur une longueur plancher : une ligne courte avec un seul mot-clé
+    # ne doit pas passer devant le paragraphe qui décrit le foyer
+    nb_mots = max(len(bloc.split()), MIN_MOTS_SCORE)
+    densite = occurrences / math.sqrt(nb_mots)
+    # Bonus pour le chapeau : date et lieu y figurent souvent
+    bonus_position = 0.2 if position < 2 else 0.0
+    # Les dates favorisent le champ "date_publication"
+    bonus_date = 0.3 if REGEX_DATE.search(bloc) else 0.0
+    return densite + bonus_position + bonus_date
+
+
+def blocs_pertinents(text: str) -> list:
+    # Retourne les blocs utiles (dédoublonnés, sans boilerplate) avec leur score
+    vus = set()
+    resultat = []
+    for bloc in decouper_blocs(text):
+        cle = bloc.lower()
+        if cle in vus or est_boilerplate(bloc):
+            continue
+        vus.add(cle)
+        resultat.append((len(resultat), bloc, score_bloc(bloc, len(resultat))))
+    return resultat
+
+
+def empaqueter(blocs: list, budget_tokens: int = BUDGET_TOKENS) -> str:
+    # Sélection des meilleurs blocs dans le budget, restitués dans l'ordre d'origine
+    retenus, utilises = [], 0
+    for position, bloc, score in sorted(blocs, key=lambda b: b[2], reverse=True):
+        cout = estimer_tokens(bloc)
+        if utilises + cout > budget_tokens:
+            # Un bloc trop long à lui seul est tronqué plutôt qu'ignoré
+            if not retenus and cout > budget_tokens:
+                retenus.append((position, bloc[:budget_tokens * CHARS_PAR_TOKEN]))
+                break
+            continue
+        retenus.append((position, bloc))
+        utilises += cout
+    retenus.sort()
+    return "\n".join(bloc for _, bloc in retenus)
+
+
+def decouper_en_chunks(blocs: list, budget_tokens: int = BUDGET_TOKENS) -> list:
+    # Chunks consécutifs de taille <= budget pour la phase "map", avec le total
+    # de mots-clés qu'ils contiennent (les blocs sont déjà bornés par
+    # decouper_blocs, rien n'est tronqué)
+    chunks, courant, utilises, occurrences = [], [], 0, 0
+    for _, bloc, _ in blocs:
+        cout = estimer_tokens(bloc)
+        if courant and utilises + cout > budget_tokens:
+            chunks.append(("\n".join(courant), occurrences))
+            courant, utilises, occurrences = [], 0, 0
+        courant.append(bloc)
+        utilises += cout
+        occurrences += compter_mots_cles(bloc)
+    if courant:
+        chunks.append(("\n".join(courant), occurrences))
+    return chunks
+
+
+def reduire_texte(text: str, budget_tokens: int = BUDGET_TOKENS) -> str:
+    blocs = blocs_pertinents(text)
+    if not blocs:
+        return text[:budget_tokens * CHARS_PAR_TOKEN]
+    return empaqueter(blocs, budget_tokens)
+
+
+def necessite_map_reduce(blocs: list, budget_tokens: int = BUDGET_TOKENS) -> bool:
+    total = sum(estimer_tokens(bloc) for _, bloc, _ in blocs)
+    return total > SEUIL_MAP_REDUCE * budget_tokens
@@ -181,6 +181,113 @@ def test_input_file():
         print("❌ Fichier d'entrée manquant\n")
         return False
 
+def test_text_reducer():
+    """Vérifie la réduction du texte envoyé au LLM (sans appel au LLM)"""
+    print("🔍 Test de la réduction de texte...")
+
+    sys.path.insert(0, str(Path(__file__).parent))
+    from src.text_reducer import (
+        BUDGET_TOKENS, CHARS_PAR_TOKEN, blocs_pertinents, decouper_en_chunks, est_boilerplate,
+        reduire_texte
+    )
+
+    foyer = " ".join(
+        f"Le foyer {i} de grippe aviaire H5N1 touche un élevage de volailles près de Sfax, "
+        f"où {i * 100} poulets ont été abattus par les services vétérinaires."
+        for i in range(40)
+    )
+    article = "\n".join([
+        "Accueil | Actualités.",
+        "Grippe aviaire au Maroc",
+        "Publié le 12 mars 2024",
+        foyer,
+        "Newsletter élevage",
+        "© 2024 Le Journal de l'élevage - Tous droits réservés",
+    ])
+
+    reduit = reduire_texte(article)
+    # Paragraphe unique de ~16k caractères : doit être découpé, pas tronqué
+    tres_long = " ".join(
+        f"Le cas {i} de peste porcine a été signalé dans une ferme de porcs." for i in range(250)
+    )
+    chunks = decouper_en_chunks(blocs_pertinents(tres_long))
+    checks = {
+        "paragraphe long sur une ligne conservé": "abattus" in reduit and len(reduit) > 2000,
+        "budget respecté": len(reduit) <= BUDGET_TOKENS * CHARS_PAR_TOKEN + 100,
+        "titre conservé": "Grippe aviaire au Maroc" in reduit,
+        "ligne de date conservée": "Publié le 12 mars 2024" in reduit,
+        # Phrase sans mot-clé : seul le filtre de navigation pourrait l'écarter
+        "phrase avec 'recherche' conservée": not est_boilerplate(
+            "Le ministère a lancé une recherche nationale sur la qualité de l'eau."
+        ),
+        # Ponctuée et courte : seule la règle de navigation l'écarte
+        "lien de navigation écarté": "Accueil" not in reduit and est_boilerplate("Accueil | Actualités."),
+        "bandeaux avec mot-clé écartés": "Newsletter" not in reduit and "©" not in reduit
+            and est_boilerplate("Share on Facebook: avian flu"),
+        "map-reduce sans troncature": sum(len(c) for c, _ in chunks) >= len(tres_long) * 0.95,
+    }
+
+    for nom, ok in checks.items():
+        print(f"  {'✓' if ok else '✗'} {nom}")
+
+    if all(checks.values()):
+        print("✅ Réduction de texte OK\n")
+        return True
+    print("❌ Réduction de texte incorrecte\n")
+    return False
+
+def test_map_reduce():
+    """Vérifie la phase map-reduce avec un LLM simulé"""
+    print("🔍 Test du map-reduce...")
+
+    sys.path.insert(0, str(Path(__file__).parent))
+    try:
+        from src import llm_processor
+        from src.text_reducer import reduire_texte
+    except ImportError as e:
+        print(f"❌ Import impossible: {e}\n")
+        return False
+
+    texte = "\n".join(
+        f"Le cas {i} de peste porcine a été signalé dans une ferme de porcs de la région {i % 7}."
+        for i in range(400)
+    )
+    appels = []
+
+    def llm_simule(reponses):
+        def query(prompt):
+            appels.append(prompt)
+            return reponses[(len(appels) - 1) % len(reponses)]
+        return query
+
+    query_origine = llm_processor.query_ollama
+    try:
+        llm_processor.query_ollama = llm_simule(["RIEN", "Aucune information : RIEN", "Foyer de peste porcine."])
+        contenu = llm_processor.preparer_contenu(texte)
+        nb_appels = len(appels)
+
+        appels.clear()
+        llm_processor.query_ollama = llm_simule([" RIEN "])
+        repli = llm_processor.preparer_contenu(texte)
+    finally:
+        llm_processor.query_ollama = query_origine
+
+    checks = {
+        "appels plafonnés à MAX_CHUNKS_MAP": 0 < nb_appels <= llm_processor.MAX_CHUNKS_MAP,
+        "notes RIEN écartées": "Foyer de peste porcine." in contenu
+            and "\nRIEN" not in "\n" + contenu,
+        "repli sur reduire_texte sans note": repli == reduire_texte(texte),
+    }
+
+    for nom, ok in checks.items():
+        print(f"  {'✓' if ok else '✗'} {nom}")
+
+    if all(checks.values()):
+        print("✅ Map-reduce OK\n")
+        return True
+    print("❌ Map-reduce incorrect\n")
+    return False
+
 def main():
     """Fonction principale"""
     print("="*60)
@@ -193,7 +300,9 @@ def main():
         "Selenium": test_selenium(),
         "Ollama": test_ollama(),
         "Dossiers": test_directories(),
-        "Fichier d'entrée": test_input_file()
+        "Fichier d'entrée": test_input_file(),
+        "Réduction de texte": test_text_reducer(),
+        "Map-reduce": test_map_reduce()
     }
     
     print("="*60)